@@ -75,19 +75,29 @@ class AzureTableStorage:
     def list_records(self) -> list:
         try:
             entities = self.table_client.list_entities()
-            records = []
-            for entity in entities:
-                # Convert entity to dictionary and ensure timestamp is included
-                entity_dict = dict(entity)
-                
-                # Azure Table Storage entities have metadata that includes timestamp
-                if hasattr(entity, 'metadata'):
-                    logging.info(f"List entity metadata: {entity.metadata}")
-                    if 'timestamp' in entity.metadata:
-                        entity_dict['Timestamp'] = entity.metadata['timestamp']
-                
-                records.append(entity_dict)
-            return records
+            return [self._to_record(entity) for entity in entities]
         except Exception as e:
             logging.error(f"Error listing records from {self.table_name}: {e}")
             return []
+
+    def query_records(self, query_filter: str, parameters: Optional[Dict[str, Any]] = None) -> list:
+        """List records matching an OData filter, evaluated server-side"""
+        try:
+            entities = self.table_client.query_entities(query_filter=query_filter, parameters=parameters)
+            return [self._to_record(entity) for entity in entities]
+        except Exception as e:
+            logging.error(f"Error querying records from {self.table_name} ({query_filter}): {e}")
+            return []
+
+    def _to_record(self, entity) -> Dict[str, Any]:
+        # Convert entity to dictionary and ensure timestamp is included
+        entity_dict = dict(entity)
+        
+        # Azure Table Storage entities have metadata that includes timestamp
+        if hasattr(entity, 'metadata'):
+            if logging.root.isEnabledFor(logging.DEBUG):
+                logging.debug(f"List entity metadata: {entity.metadata}")
+            if 'timestamp' in entity.metadata:
+                entity_dict['Timestamp'] = entity.metadata['timestamp']
+        
+        return entity_dict
@@ -1,9 +1,12 @@
 import os
+from functools import lru_cache
 
+@lru_cache(maxsize=1)
 def get_env_variables():
     """
     Returns a dictionary of environment variables for the given names.
     If a variable is not set, its value will be None.
+    The values are read once per process, app setting changes restart the Functions host.
     """
     API_KEY = os.getenv("BINANCE_API_KEY")
     API_SECRET = os.getenv("BINANCE_API_SECRET")
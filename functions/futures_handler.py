@@ -4,6 +4,7 @@ from utils.storage_factory import create_table_storage_client, create_queue_clie
 from trading_enums import TradingEnums, SignalType
 import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 def handle_futures(signal_type):
     client = create_futures_client()
@@ -24,9 +25,13 @@ def handle_futures(signal_type):
         if trading_config is None:
             raise Exception(f"Trading config for symbol '{SYMBOL}' not found.")
         
-        quantity = client.calculate_trade_quantity(trading_config)
-        records = ats_client.list_records()
-        response_message = client.execute_trade_with_sl_tp(desired_side, quantity, records, trading_config)
+        # Load TP/SL configs from table storage while market data is fetched from Binance
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            records_future = executor.submit(ats_client.list_records)
+            context = client.build_trade_context(trading_config)
+            quantity = client.calculate_trade_quantity(trading_config, context)
+            records = records_future.result()
+        response_message = client.execute_trade_with_sl_tp(desired_side, quantity, records, trading_config, context)
 
         try:
             queue_client = create_queue_client(queue_name="orders")
@@ -5,6 +5,7 @@ import os
 from typing import Dict, Any, Optional
 from datetime import datetime
 from azure_table_storage import AzureTableStorage
+from utils.fast_json import parse_request_body
 from models.tp_sl_info import TakeProfitStopLossInfo
 
 def format_timestamp(timestamp) -> Optional[str]:
@@ -154,7 +155,7 @@ def create_record(req: func.HttpRequest, table_storage: AzureTableStorage) -> fu
     """Create a new record"""
     try:
         # Parse request body
-        req_body = req.get_json()
+        req_body = parse_request_body(req)
         if not req_body:
             return func.HttpResponse(
                 json.dumps({"error": "Request body is required"}),
@@ -235,7 +236,7 @@ def update_record(req: func.HttpRequest, table_storage: AzureTableStorage, recor
     """Update an existing record"""
     try:
         # Parse request body
-        req_body = req.get_json()
+        req_body = parse_request_body(req)
         if not req_body:
             return func.HttpResponse(
                 json.dumps({"error": "Request body is required"}),
@@ -300,7 +301,7 @@ def delete_record(req: func.HttpRequest, table_storage: AzureTableStorage, recor
         # Try to get partition key from request body
         partition_key = "tp"  # default
         try:
-            req_body = req.get_json()
+            req_body = parse_request_body(req)
             if req_body and "PartitionKey" in req_body:
                 partition_key = req_body["PartitionKey"]
                 logging.info(f"Using partition key from request body: {partition_key}")
@@ -312,14 +313,12 @@ def delete_record(req: func.HttpRequest, table_storage: AzureTableStorage, recor
         
         # If not found with specified partition key, search all partitions
         if not existing:
-            logging.info(f"Record not found with PartitionKey '{partition_key}', searching all records...")
-            all_entities = table_storage.list_records()
-            for ent in all_entities:
-                if ent.get("RowKey") == record_id:
-                    existing = ent
-                    partition_key = ent.get("PartitionKey", "tp")
-                    logging.info(f"Found record with PartitionKey: {partition_key}")
-                    break
+            logging.info(f"Record not found with PartitionKey '{partition_key}', searching all partitions...")
+            matches = table_storage.query_records("RowKey eq @row_key", {"row_key": record_id})
+            if matches:
+                existing = matches[0]
+                partition_key = existing.get("PartitionKey", "tp")
+                logging.info(f"Found record with PartitionKey: {partition_key}")
         
         if not existing:
             return func.HttpResponse(
@@ -7,6 +7,10 @@ import os
 from typing import Any, Dict
 from datetime import datetime
 from azure_table_storage import AzureTableStorage
+from utils.fast_json import parse_request_body
+
+# Fields a trading config must provide on creation
+REQUIRED_CONFIG_FIELDS = ("PartitionKey", "RowKey", "leverage", "wallet_allocation", "chart_time_interval", "atr_candles")
 
 def json_serial(obj: Any) -> str:
     """JSON serializer for objects not serializable by default json code"""
@@ -137,13 +141,13 @@ def get_all_records(table_storage: AzureTableStorage) -> func.HttpResponse:
 def create_record(req: func.HttpRequest, table_storage: AzureTableStorage) -> func.HttpResponse:
     """Create a new record"""
     try:
-        body = req.get_json()
+        body = parse_request_body(req)
         
         # Basic validation
-        required_fields = ["PartitionKey", "RowKey", "leverage", "wallet_allocation", "chart_time_interval", "atr_candles"]
-        if not all(field in body for field in required_fields):
+        missing_fields = [field for field in REQUIRED_CONFIG_FIELDS if field not in body]
+        if missing_fields:
             return func.HttpResponse(
-                json.dumps({"error": "Missing required fields"}),
+                json.dumps({"error": f"Missing required fields: {', '.join(missing_fields)}"}),
                 status_code=400,
                 mimetype="application/json"
             )
@@ -181,7 +185,7 @@ def create_record(req: func.HttpRequest, table_storage: AzureTableStorage) -> fu
 def update_record(req: func.HttpRequest, table_storage: AzureTableStorage, record_id: str) -> func.HttpResponse:
     """Update an existing record"""
     try:
-        body = req.get_json()
+        body = parse_request_body(req)
         
         partition_key = body.get("PartitionKey")
         if not partition_key:
@@ -224,7 +228,7 @@ def update_record(req: func.HttpRequest, table_storage: AzureTableStorage, recor
 def delete_record(req: func.HttpRequest, table_storage: AzureTableStorage, record_id: str) -> func.HttpResponse:
     """Delete a record"""
     try:
-        body = req.get_json()
+        body = parse_request_body(req)
         partition_key = body.get("PartitionKey")
         if not partition_key:
             return func.HttpResponse(
@@ -1,20 +1,63 @@
 import logging
+import random
+import threading
 import time
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 from binance.um_futures import UMFutures
+from requests.adapters import HTTPAdapter
 from technical_analysis import TechnicalAnalysis
-from trading_config import SYMBOL
-from managers import PositionManager, OrderCalculator, TakeProfitStopLossManager
+from trading_config import SYMBOL, TIME_SYNC_INTERVAL_SECONDS, LISTEN_KEY_RENEW_INTERVAL_SECONDS, BINANCE_HTTP_POOL_SIZE
+from managers import PositionManager, OrderCalculator, TakeProfitStopLossManager, UserDataStreamManager
+from models.trade_context import TradeContext
 from trading_enums import TradingEnums
+from utils.binance_time import install_time_offset, sync_time_offset
+from utils.binance_websocket import install_connect_timeout
+from utils.fast_json import install_fast_json
+
+# Fill price polls, spanning ~2.5s in total like the previous fixed 0.5s interval
+FILL_POLL_ATTEMPTS = 8
 
 class FuturesClient:
     """Main futures trading client - simplified and focused"""
     
     def __init__(self, api_key: str, api_secret: str):
+        install_time_offset()
+        install_connect_timeout()
         self.client = UMFutures(api_key, api_secret)
+        self.client.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=BINANCE_HTTP_POOL_SIZE))
+        install_fast_json(self.client.session)
         self.position_manager = PositionManager(self.client)
         self.calculator = OrderCalculator(self.client)
         self.tp_sl_manager = TakeProfitStopLossManager(self.client, self.calculator)
+        self.user_data_stream = UserDataStreamManager(self.client)
+        self._ta = TechnicalAnalysis(client=self.client)
+        threading.Thread(target=self._maintain_connection, daemon=True).start()
+    
+    def _maintain_connection(self):
+        """Open the Binance connection and user data stream, then keep them fresh off the trade path"""
+        # The time request also completes DNS + TCP + TLS so the pooled connection is ready for the first order
+        self._sync_time()
+        self.user_data_stream.start()
+        
+        last_renewal = time.monotonic()
+        while True:
+            time.sleep(TIME_SYNC_INTERVAL_SECONDS)
+            self._sync_time()
+            if not self.user_data_stream.is_running:
+                self.user_data_stream.start()
+                last_renewal = time.monotonic()
+            elif time.monotonic() - last_renewal >= LISTEN_KEY_RENEW_INTERVAL_SECONDS:
+                self.user_data_stream.renew_listen_key()
+                last_renewal = time.monotonic()
+    
+    def _sync_time(self):
+        """Refresh the offset between Binance server time and the local clock"""
+        try:
+            offset = sync_time_offset(self.client)
+            logging.info(f"Binance server time offset: {offset} ms")
+        except Exception as e:
+            logging.warning(f"Binance time sync failed: {e}")
     
     def manage_existing_position(self, desired_side: str) -> bool:
         """Check and manage existing positions before new trade"""
@@ -34,34 +77,57 @@ class FuturesClient:
         logging.info(f"Closing opposing {position.side} position")
         return self.position_manager.close_position(position)
     
-    def calculate_trade_quantity(self, config: Dict[str, Any]) -> float:
+    def build_trade_context(self, config: Dict[str, Any]) -> TradeContext:
+        """Fetch balance, price, symbol info and ATR for one signal concurrently"""
+        timeframe = config["chart_time_interval"]
+        atr_candles = int(config["atr_candles"])
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            balance_future = executor.submit(self.calculator.get_usdt_balance)
+            price_future = executor.submit(self.calculator.get_current_price, SYMBOL)
+            symbol_info_future = executor.submit(self.calculator.get_symbol_info, SYMBOL)
+            atr_future = executor.submit(self._get_atr, SYMBOL, timeframe, atr_candles)
+            
+            current_price = price_future.result()
+            return TradeContext(
+                usdt_balance=balance_future.result(),
+                current_price=current_price,
+                symbol_info=symbol_info_future.result(),
+                atr=atr_future.result() or (current_price * 0.01)
+            )
+    
+    def _get_atr(self, symbol: str, timeframe: str, length: int) -> Optional[float]:
+        """Get ATR and keep its candles streamed so later refreshes need no request"""
+        atr = self._ta.get_atr(symbol=symbol, timeframe=timeframe, length=length)
+        if atr is not None:
+            self._ta.stream_candles(symbol, timeframe)
+        return atr
+    
+    def calculate_trade_quantity(self, config: Dict[str, Any], context: TradeContext) -> float:
         """Calculate trade quantity - delegates to calculator"""
         leverage = config["leverage"]
         wallet_allocation = config["wallet_allocation"]
-        return self.calculator.calculate_trade_quantity(SYMBOL, leverage, wallet_allocation)
+        return self.calculator.calculate_trade_quantity(SYMBOL, leverage, wallet_allocation, context)
 
-    def execute_trade_with_sl_tp(self, side: str, quantity: float, tp_sl_configs: list, config: Dict[str, Any]) -> str:
+    def execute_trade_with_sl_tp(self, side: str, quantity: float, tp_sl_configs: list,
+                                 config: Dict[str, Any], context: TradeContext) -> str:
         """Execute trade with stop loss and take profit orders"""
         try:
             leverage = int(config["leverage"])
-            timeframe = config["chart_time_interval"]
-            atr_candles = int(config["atr_candles"])
-            # Get ATR for calculations
-            ta_calculator = TechnicalAnalysis(client=self.client)
-            atr = ta_calculator.get_atr(symbol=SYMBOL, timeframe=timeframe, length=atr_candles) or (self._get_current_price(SYMBOL) * 0.01)
 
-            # Clean slate - cancel existing orders
-            self.position_manager.cancel_all_orders(SYMBOL)
-            
-            # Set leverage
-            self.client.change_leverage(symbol=SYMBOL, leverage=leverage)
+            # Clean slate - cancel existing orders while setting leverage
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cancel_future = executor.submit(self.position_manager.cancel_all_orders, SYMBOL)
+                leverage_future = executor.submit(self.client.change_leverage, symbol=SYMBOL, leverage=leverage)
+                cancel_future.result()
+                leverage_future.result()
             logging.info(f"Leverage set to {leverage}x")
 
             # Execute main order
             entry_price = self._execute_market_order(side, quantity)
             
             # Set TP/SL orders
-            self.tp_sl_manager.create_tp_sl_orders(SYMBOL, side, entry_price, quantity, tp_sl_configs, atr)
+            self.tp_sl_manager.create_tp_sl_orders(SYMBOL, side, entry_price, quantity, tp_sl_configs, context)
             
             return f"Success: {side} position opened for {quantity} {SYMBOL} at ~{entry_price}"
             
@@ -69,34 +135,47 @@ class FuturesClient:
             logging.error(f"Trade execution failed: {e}")
             raise
     
-    def _get_current_price(self, symbol: str) -> float:
-        """Get current price for symbol"""
-        ticker = self.client.ticker_price(symbol)
-        return float(ticker['price'])
-    
     def _execute_market_order(self, side: str, quantity: float) -> float:
         """Execute market order and return fill price"""
-        main_order = self.client.new_order(symbol=SYMBOL, side=side, type='MARKET', quantity=quantity)
+        client_order_id = self.user_data_stream.register_order()
+        try:
+            main_order = self.client.new_order(symbol=SYMBOL, side=side, type='MARKET', quantity=quantity,
+                                               newClientOrderId=client_order_id)
+        except Exception:
+            self.user_data_stream.discard_order(client_order_id)
+            raise
+        self.position_manager.invalidate_position(SYMBOL)
         order_id = main_order['orderId']
         logging.info(f"Market {side} order placed: {order_id}")
         
-        # Get fill price
-        for attempt in range(5):
-            order_details = self.client.get_all_orders(symbol=SYMBOL, orderId=order_id)
-            if order_details:
-                entry_price = float(order_details[0]['avgPrice'])
-                if entry_price > 0:
-                    logging.info(f"Order filled at: {entry_price}")
-                    return entry_price
-            time.sleep(0.5)
+        # Get fill price pushed by the user data stream, the push normally beats the REST response,
+        # so a silent stream only delays the polling below by 0.5s
+        entry_price = self.user_data_stream.wait_for_fill(client_order_id)
+        if entry_price:
+            logging.info(f"Order filled at: {entry_price}")
+            return entry_price
+        
+        # Fall back to polling the REST API with exponential backoff (20ms, 40ms, ... 1.28s) and jitter
+        for attempt in range(FILL_POLL_ATTEMPTS):
+            order_details = self.client.query_order(symbol=SYMBOL, orderId=order_id)
+            entry_price = float(order_details.get('avgPrice', 0))
+            if entry_price > 0:
+                logging.info(f"Order filled at: {entry_price}")
+                return entry_price
+            if attempt < FILL_POLL_ATTEMPTS - 1:
+                time.sleep(0.02 * (2 ** attempt) + random.random() * 0.01)
         
         raise Exception(f"Could not verify fill price for order {order_id}")
     
     def close_all_for_symbol(self, symbol: str) -> str:
         """Close all positions and orders for symbol"""
-        self.position_manager.cancel_all_orders(symbol)
+        # Cancelling orders does not change the position, so both calls run at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            cancel_future = executor.submit(self.position_manager.cancel_all_orders, symbol)
+            position_future = executor.submit(self.position_manager.get_position, symbol)
+            cancel_future.result()
+            position = position_future.result()
         
-        position = self.position_manager.get_position(symbol)
         if position:
             self.position_manager.close_position(position)
             return f"All orders cancelled and {position.side} position closed for {symbol}"
@@ -114,11 +193,16 @@ class FuturesClient:
     
     def close_position_if_no_open_orders(self, symbol: str) -> bool:
         """Close position only if no open orders exist"""
-        if self.position_manager.has_open_orders(symbol):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            open_orders_future = executor.submit(self.position_manager.has_open_orders, symbol)
+            position_future = executor.submit(self.position_manager.get_position, symbol)
+            has_open_orders = open_orders_future.result()
+            position = position_future.result()
+        
+        if has_open_orders:
             logging.info(f"Open orders exist for {symbol} - position not closed")
             return False
         
-        position = self.position_manager.get_position(symbol)
         if position:
             return self.position_manager.close_position(position)
         
@@ -5,5 +5,6 @@ Managers package for trading bot business logic components.
 from .position_manager import PositionManager
 from .order_calculator import OrderCalculator
 from .take_profit_stop_loss_manager import TakeProfitStopLossManager
+from .user_data_stream_manager import UserDataStreamManager
 
-__all__ = ['PositionManager', 'OrderCalculator', 'TakeProfitStopLossManager']
+__all__ = ['PositionManager', 'OrderCalculator', 'TakeProfitStopLossManager', 'UserDataStreamManager']
@@ -1,54 +1,96 @@
 import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
 from binance.um_futures import UMFutures
 from models.symbol_info import SymbolInfo
-from trading_config import TRADING_CONFIG_TABLE_NAME
+from models.trade_context import TradeContext
+from trading_config import TRADING_CONFIG_TABLE_NAME, SYMBOL_INFO_REFRESH_SECONDS
 from utils.storage_factory import create_table_storage_client
 
+# Process-wide symbol information, keyed by (REST base URL, symbol)
+_SYMBOL_CACHE: Dict[Tuple[str, str], SymbolInfo] = {}
+_SYMBOL_CACHE_LOCK = threading.Lock()
+_REFRESHED_BASE_URLS: Set[str] = set()
+
+def _load_symbol_info(client: UMFutures):
+    """Fetch exchange info once and cache every symbol from it"""
+    exchange_info = client.exchange_info()
+    symbol_infos = {
+        (client.base_url, symbol_data['symbol']): SymbolInfo(
+            symbol=symbol_data['symbol'],
+            price_precision=int(symbol_data.get('pricePrecision', 4)),
+            quantity_precision=int(symbol_data.get('quantityPrecision', 0))
+        )
+        for symbol_data in exchange_info['symbols']
+    }
+    _SYMBOL_CACHE.update(symbol_infos)
+
+def _refresh_symbol_info(client: UMFutures):
+    """Periodically re-pull exchange info to pick up new listings and precision changes"""
+    while True:
+        time.sleep(SYMBOL_INFO_REFRESH_SECONDS)
+        try:
+            _load_symbol_info(client)
+            logging.info("Symbol information refreshed")
+        except Exception as e:
+            logging.warning(f"Could not refresh symbol information: {e}")
+
+def get_symbol_info(client: UMFutures, symbol: str) -> SymbolInfo:
+    """Get symbol information from the process-wide cache"""
+    key = (client.base_url, symbol)
+    symbol_info = _SYMBOL_CACHE.get(key)
+    if symbol_info is not None:
+        return symbol_info
+    
+    with _SYMBOL_CACHE_LOCK:
+        if key not in _SYMBOL_CACHE:
+            _load_symbol_info(client)
+        if client.base_url not in _REFRESHED_BASE_URLS:
+            _REFRESHED_BASE_URLS.add(client.base_url)
+            threading.Thread(target=_refresh_symbol_info, args=(client,), daemon=True).start()
+    
+    if key not in _SYMBOL_CACHE:
+        raise Exception(f"Could not retrieve exchange info for {symbol}")
+    return _SYMBOL_CACHE[key]
+
 class OrderCalculator:
     """Handles order quantity and price calculations"""
     
     def __init__(self, client: UMFutures):
         self.client = client
-        self._symbol_cache = {}
     
     def get_symbol_info(self, symbol: str) -> SymbolInfo:
         """Get cached symbol information"""
-        if symbol not in self._symbol_cache:
-            exchange_info = self.client.exchange_info()
-            symbol_data = next((s for s in exchange_info['symbols'] if s['symbol'] == symbol), None)
-            
-            if not symbol_data:
-                raise Exception(f"Could not retrieve exchange info for {symbol}")
-            
-            self._symbol_cache[symbol] = SymbolInfo(
-                symbol=symbol,
-                price_precision=int(symbol_data.get('pricePrecision', 4)),
-                quantity_precision=int(symbol_data.get('quantityPrecision', 0))
-            )
-        
-        return self._symbol_cache[symbol]
+        return get_symbol_info(self.client, symbol)
     
     def get_current_price(self, symbol: str) -> float:
         """Get current price for symbol"""
         ticker = self.client.ticker_price(symbol)
         return float(ticker['price'])
 
-    def calculate_trade_quantity(self, symbol: str, leverage: float, wallet_allocation: float) -> float:
+    def get_usdt_balance(self) -> float:
+        """Get USDT wallet balance"""
+        balances = self.client.balance()
+        return next((float(b['balance']) for b in balances if b['asset'] == 'USDT'), 0.0)
+
+    def calculate_trade_quantity(self, symbol: str, leverage: float, wallet_allocation: float,
+                                 context: Optional[TradeContext] = None) -> float:
         """Calculate trade quantity based on balance and leverage"""
         
-        # Get USDT balance
-        balances = self.client.balance()
-        usdt_balance = next((float(b['balance']) for b in balances if b['asset'] == 'USDT'), 0.0)
+        # Reuse balance, price and symbol info already fetched for this signal
+        if context:
+            usdt_balance = context.usdt_balance
+            current_price = context.current_price
+            symbol_info = context.symbol_info
+        else:
+            usdt_balance = self.get_usdt_balance()
+            current_price = self.get_current_price(symbol)
+            symbol_info = self.get_symbol_info(symbol)
         
         if usdt_balance == 0.0:
             raise Exception("Could not retrieve USDT balance or balance is zero.")
         
-        # Get current price
-        current_price = self.get_current_price(symbol)
-        
-        # Get symbol info
-        symbol_info = self.get_symbol_info(symbol)
-        
         # Calculate quantity
         trade_value_in_usdt = usdt_balance * wallet_allocation
         quantity = (trade_value_in_usdt * leverage) / current_price
@@ -1,32 +1,60 @@
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
 from binance.um_futures import UMFutures
 from binance.error import ClientError
 
 from models.position_info import PositionInfo
 from trading_enums import PositionSide, TradingEnums
 
+# Positions read within this window are served from memory instead of another positionRisk call
+POSITION_CACHE_TTL_SECONDS = 1.0
+
 class PositionManager:
     """Handles position-related operations"""
     
     def __init__(self, client: UMFutures):
         self.client = client
+        self._position_cache: Dict[str, Tuple[float, Optional[PositionInfo]]] = {}
+        self._position_cache_lock = threading.Lock()
     
     def get_position(self, symbol: str) -> Optional[PositionInfo]:
-        """Get current position for symbol"""
+        """Get current position for symbol, reusing a read from the last POSITION_CACHE_TTL_SECONDS"""
+        now = time.monotonic()
+        with self._position_cache_lock:
+            cached = self._position_cache.get(symbol)
+        if cached and now < cached[0]:
+            return cached[1]
+        
+        position = self._fetch_position(symbol)
+        with self._position_cache_lock:
+            self._position_cache[symbol] = (now + POSITION_CACHE_TTL_SECONDS, position)
+        return position
+    
+    def invalidate_position(self, symbol: str):
+        """Drop the cached position after an order that changes it"""
+        with self._position_cache_lock:
+            self._position_cache.pop(symbol, None)
+    
+    def _fetch_position(self, symbol: str) -> Optional[PositionInfo]:
+        """Fetch current position for symbol from Binance"""
+        # The response is already filtered to the symbol server-side
         positions = self.client.get_position_risk(symbol=symbol)
-        current_position = next((p for p in positions if p['symbol'] == symbol and float(p['positionAmt']) != 0), None)
+        for position in positions:
+            # Zero amounts come back as strings of zeros ("0.000"), skip them without a float conversion
+            if not str(position['positionAmt']).strip('0.-'):
+                continue
+            position_amt = float(position['positionAmt'])
+            if position_amt != 0:
+                return PositionInfo(
+                    symbol=symbol,
+                    amount=abs(position_amt),
+                    side=PositionSide.LONG.value if position_amt > 0 else PositionSide.SHORT.value,
+                    entry_price=float(position.get('entryPrice', 0))
+                )
         
-        if not current_position:
-            return None
-            
-        position_amt = float(current_position['positionAmt'])
-        return PositionInfo(
-            symbol=symbol,
-            amount=abs(position_amt),
-            side=PositionSide.LONG.value if position_amt > 0 else PositionSide.SHORT.value,
-            entry_price=float(current_position.get('entryPrice', 0))
-        )
+        return None
     
     def has_open_orders(self, symbol: str) -> bool:
         """Check if symbol has any open orders"""
@@ -63,3 +91,5 @@ class PositionManager:
         except ClientError as e:
             logging.error(f"Failed to close position: {e}")
             return False
+        finally:
+            self.invalidate_position(position.symbol)
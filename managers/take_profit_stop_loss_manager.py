@@ -1,11 +1,20 @@
 import logging
-from typing import List, Dict, Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_DOWN
+from typing import List, Dict, Optional, Tuple
 from binance.um_futures import UMFutures
 from binance.error import ClientError
 
 from models.symbol_info import SymbolInfo
+from models.trade_context import TradeContext
 from managers.order_calculator import OrderCalculator
-from trading_enums import OrderSide
+from trading_enums import OrderSide, TradingEnums
+
+# Binance accepts at most 5 orders per batchOrders request
+BATCH_ORDER_LIMIT = 5
+# Distinct TP/SL setups kept parsed in memory
+PARSED_CONFIGS_CACHE_SIZE = 16
 
 class TakeProfitStopLossManager:
     """Handles TP/SL order creation"""
@@ -13,227 +22,201 @@ class TakeProfitStopLossManager:
     def __init__(self, client: UMFutures, calculator: OrderCalculator):
         self.client = client
         self.calculator = calculator
+        self._parsed_configs_cache: Dict[Tuple, Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict[str, Optional[float]]]] = {}
     
     def create_tp_sl_orders(self, symbol: str, side: str, entry_price: float, 
-                          quantity: float, tp_sl_configs: List[Dict], atr: float):
+                          quantity: float, tp_sl_configs: List[Dict], context: TradeContext):
         """Create take profit and stop loss orders"""
-        symbol_info = self.calculator.get_symbol_info(symbol)
-        close_side = OrderSide.SELL.value if side == OrderSide.BUY.value else OrderSide.BUY.value
+        if quantity <= 0:
+            logging.warning(f"No TP/SL orders created for {symbol} as the position quantity is zero")
+            return
+        
+        atr = context.atr
+        symbol_info = context.symbol_info
+        close_side = TradingEnums.order_to_close_side(side)
+        # +1 for long positions (TP above entry, SL below), -1 for short positions
+        sign = 1.0 if side == OrderSide.BUY.value else -1.0
+        orders: List[Tuple[str, Dict]] = []
         
         # Parse configurations
-        tp_levels = self._parse_tp_levels(tp_sl_configs)
-        sl_levels = self._parse_sl_levels(tp_sl_configs)
-        last_tp_atr = self._get_last_tp_atr(tp_sl_configs)
-        last_sl_atr = self._get_last_sl_atr(tp_sl_configs)
-        trailing_sl_atr = self._get_trailing_sl_atr(tp_sl_configs)
+        levels, final_atrs = self._get_parsed_configs(tp_sl_configs)
+        tp_levels = levels['tp']
+        sl_levels = levels['sl']
+        last_tp_atr = final_atrs['tp']
+        last_sl_atr = final_atrs['sl']
+        trailing_sl_atr = final_atrs['tsl']
         
-        # Create TP orders
-        remaining_quantity_tp = self._create_tp_orders(symbol, close_side, entry_price, quantity, tp_levels, atr, symbol_info)
+        # Build TP orders
+        remaining_quantity_tp = self._build_level_orders(orders, "Take Profit", "TAKE_PROFIT_MARKET", symbol, close_side,
+                                                         sign, entry_price, quantity, tp_levels, atr, symbol_info)
         
-        # Create SL orders
-        remaining_quantity_sl = self._create_sl_orders(symbol, close_side, entry_price, quantity, sl_levels, atr, symbol_info)
+        # Build SL orders
+        remaining_quantity_sl = self._build_level_orders(orders, "Stop Loss", "STOP_MARKET", symbol, close_side,
+                                                         -sign, entry_price, quantity, sl_levels, atr, symbol_info)
 
-        # Create final TP for remaining quantity
+        # Build final TP for remaining quantity
         if last_tp_atr and remaining_quantity_tp > 0:
-            self._create_final_tp(symbol, close_side, entry_price, remaining_quantity_tp, last_tp_atr, atr, symbol_info)
+            self._build_final_order(orders, "Take Profit", "TAKE_PROFIT_MARKET", symbol, close_side,
+                                    sign, entry_price, remaining_quantity_tp, last_tp_atr, atr, symbol_info)
 
-        # Create final SL for remaining quantity
+        # Build final SL for remaining quantity
         if last_sl_atr and remaining_quantity_sl > 0:
-            self._create_final_sl(symbol, close_side, entry_price, remaining_quantity_sl, last_sl_atr, atr, symbol_info)
+            self._build_final_order(orders, "Stop Loss", "STOP_MARKET", symbol, close_side,
+                                    -sign, entry_price, remaining_quantity_sl, last_sl_atr, atr, symbol_info)
 
-        # Create trailing SL if configured
+        # Build trailing SL if configured
         if trailing_sl_atr:
-            self._create_trailing_sl(symbol, close_side, entry_price, quantity, trailing_sl_atr, atr)
-    
-    def _parse_tp_levels(self, configs: List[Dict]) -> List[Dict]:
-        """Parse TP levels from configuration"""
-        tp_levels = []
-        tp_list = [record for record in configs 
-                  if str(record.get('PartitionKey', '')).lower() == 'tp' 
-                  and str(record.get('close_fraction', '')).lower() != '']
-        
-        for record in tp_list:
-            try:
-                atr_multiple = float(record.get('atr_multiple', 0))
-                close_fraction = float(record.get('close_fraction', 0)) / 100
-                tp_levels.append({"atr_multiple": atr_multiple, "close_fraction": close_fraction})
-            except ValueError as e:
-                logging.error(f"Invalid TP record: {record}. Error: {e}")
-        return tp_levels
-    
-    def _get_last_tp_atr(self, configs: List[Dict]) -> Optional[float]:
-        """Get last TP ATR multiplier"""
-        last_tp_atr = [float(record.get('atr_multiple', 0)) for record in configs 
-                      if str(record.get('PartitionKey', '')).lower() == 'tp' 
-                      and str(record.get('close_fraction', '')).lower() == '']
-        return last_tp_atr[0] if last_tp_atr else None
+            self._build_trailing_sl(orders, symbol, close_side, entry_price, quantity, trailing_sl_atr, atr, symbol_info)
 
-    def _parse_sl_levels(self, configs: List[Dict]) -> List[Dict]:
-        """Parse SL levels from configuration"""
-        sl_levels = []
-        sl_list = [record for record in configs 
-                  if str(record.get('PartitionKey', '')).lower() == 'sl' 
-                  and str(record.get('close_fraction', '')).lower() != '']
-        
-        for record in sl_list:
-            try:
-                atr_multiple = float(record.get('atr_multiple', 0))
-                close_fraction = float(record.get('close_fraction', 0)) / 100
-                sl_levels.append({"atr_multiple": atr_multiple, "close_fraction": close_fraction})
-            except ValueError as e:
-                logging.error(f"Invalid SL record: {record}. Error: {e}")
-        return sl_levels
-
-    def _get_last_sl_atr(self, configs: List[Dict]) -> Optional[float]:
-        """Get last SL ATR multiplier"""
-        last_sl_atr = [float(record.get('atr_multiple', 0)) for record in configs
-                      if str(record.get('PartitionKey', '')).lower() == 'sl'
-                      and str(record.get('close_fraction', '')).lower() == '']
-        return last_sl_atr[0] if last_sl_atr else None
-
-    def _get_trailing_sl_atr(self, configs: List[Dict]) -> Optional[float]:
-        """Get trailing stop loss ATR multiplier"""
-        trailing_sl_atr = [float(record.get('atr_multiple', 0)) for record in configs 
-                          if str(record.get('PartitionKey', '')).lower() == 'tsl' 
-                          and str(record.get('close_fraction', '')).lower() == '']
-        return trailing_sl_atr[0] if trailing_sl_atr else None
+        self._submit_orders(orders)
     
-    def _create_tp_orders(self, symbol: str, close_side: str, entry_price: float, 
-                         quantity: float, tp_levels: List[Dict], atr: float, symbol_info: SymbolInfo) -> float:
-        """Create multiple take profit orders and return remaining quantity"""
-        remaining_quantity = quantity
-        
-        for i, level in enumerate(tp_levels):
-            tp_quantity = round(quantity * level['close_fraction'], symbol_info.quantity_precision)
-            
-            # Calculate TP price
-            if close_side == OrderSide.SELL.value:  # Long position
-                tp_price = entry_price + (atr * level['atr_multiple'])
-            else:  # Short position
-                tp_price = entry_price - (atr * level['atr_multiple'])
+    def _get_parsed_configs(self, configs: List[Dict]) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict[str, Optional[float]]]:
+        """Parse configurations once per distinct TP/SL setup and reuse the result on later trades"""
+        key = tuple((record.get('PartitionKey'), record.get('atr_multiple'), record.get('close_fraction'))
+                    for record in configs)
+        parsed = self._parsed_configs_cache.get(key)
+        if parsed is None:
+            if len(self._parsed_configs_cache) >= PARSED_CONFIGS_CACHE_SIZE:
+                self._parsed_configs_cache.clear()
+            parsed = self._parse_configs(configs)
+            self._parsed_configs_cache[key] = parsed
+        return parsed
+    
+    def _parse_configs(self, configs: List[Dict]) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict[str, Optional[float]]]:
+        """Parse partial TP/SL levels and final TP/SL/trailing ATR multipliers in a single pass"""
+        levels = {'tp': ([], []), 'sl': ([], [])}
+        final_atrs: Dict[str, Optional[float]] = {'tp': None, 'sl': None, 'tsl': None}
+        for record in configs:
+            get = record.get
+            partition_key = str(get('PartitionKey', '')).lower()
+            raw_close_fraction = get('close_fraction', '')
             
-            tp_price_str = f"{tp_price:.{symbol_info.price_precision}f}"
+            # Records without close fraction hold the final (remaining quantity) or trailing multiplier
+            if not str(raw_close_fraction).strip():
+                if partition_key in final_atrs and final_atrs[partition_key] is None:
+                    final_atrs[partition_key] = float(get('atr_multiple', 0))
+                continue
             
-            # Check minimum notional
-            if tp_quantity * tp_price < symbol_info.min_notional:
-                logging.warning(f"Skipping Take Profit order #{i+1} as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
+            if partition_key not in levels:
                 continue
             
             try:
-                self.client.new_order(
-                    symbol=symbol,
-                    side=close_side,
-                    type='TAKE_PROFIT_MARKET',
-                    stopPrice=tp_price_str,
-                    quantity=tp_quantity
-                )
-                logging.info(f"Take Profit order #{i+1} placed: close {tp_quantity} at {tp_price_str}")
-                remaining_quantity -= tp_quantity
-            except ClientError as e:
-                logging.error(f"Failed to place TP order #{i+1}: {e}")
+                atr_multiple = float(get('atr_multiple', 0))
+                close_fraction = float(raw_close_fraction) / 100
+            except ValueError as e:
+                logging.error(f"Invalid {partition_key.upper()} record: {record}. Error: {e}")
+                continue
+            
+            atr_multiples, close_fractions = levels[partition_key]
+            atr_multiples.append(atr_multiple)
+            close_fractions.append(close_fraction)
         
-        return remaining_quantity
+        parsed_levels = {key: (self._frozen_array(atr_multiples), self._frozen_array(close_fractions))
+                         for key, (atr_multiples, close_fractions) in levels.items()}
+        return parsed_levels, final_atrs
     
-    def _create_final_tp(self, symbol: str, close_side: str, entry_price: float, 
-                        remaining_quantity: float, last_tp_atr: float, atr: float, symbol_info: SymbolInfo):
-        """Create final TP order for remaining quantity"""
-        if close_side == OrderSide.SELL.value:  # Long position
-            last_tp_price = entry_price + (atr * last_tp_atr)
-        else:  # Short position
-            last_tp_price = entry_price - (atr * last_tp_atr)
+    @staticmethod
+    def _frozen_array(values: List[float]) -> np.ndarray:
+        """Build a read-only float array, parsed levels are shared between trades"""
+        array = np.array(values, dtype=np.float64)
+        array.flags.writeable = False
+        return array
+    
+    def _build_level_orders(self, orders: List[Tuple[str, Dict]], label: str, order_type: str, symbol: str, close_side: str,
+                            direction: float, entry_price: float, quantity: float, levels: Tuple[np.ndarray, np.ndarray],
+                            atr: float, symbol_info: SymbolInfo) -> float:
+        """Build partial TP or SL orders, direction is +1 above entry and -1 below, and return remaining quantity"""
+        atr_multiples, close_fractions = levels
         
-        last_tp_price_str = f"{last_tp_price:.{symbol_info.price_precision}f}"
+        # Calculate prices and quantities for all levels at once
+        prices = entry_price + direction * atr * atr_multiples
         
-        if remaining_quantity * last_tp_price >= symbol_info.min_notional:
-            try:
-                self.client.new_order(
-                    symbol=symbol,
-                    side=close_side,
-                    type='TAKE_PROFIT_MARKET',
-                    stopPrice=last_tp_price_str,
-                    quantity=round(remaining_quantity, symbol_info.quantity_precision)
-                )
-                logging.info(f"Take Profit order #final (remaining) placed: close {round(remaining_quantity, symbol_info.quantity_precision)} at {last_tp_price_str}")
-            except ClientError as e:
-                logging.error(f"Failed to place final TP order: {e}")
-        else:
-            logging.warning(f"Skipping final Take Profit order as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
-    
-    def _create_sl_orders(self, symbol: str, close_side: str, entry_price: float, 
-                         quantity: float, sl_levels: List[Dict], atr: float, symbol_info: SymbolInfo) -> float:
-        """Create multiple stop loss orders and return remaining quantity"""
-        remaining_quantity = quantity
+        # Round quantities down on exact decimals so they never exceed the allowed precision
+        quantity_step = symbol_info.quantity_step
+        quantity_decimal = Decimal(str(quantity))
+        level_quantities = [(quantity_decimal * Decimal(str(fraction))).quantize(quantity_step, rounding=ROUND_DOWN)
+                            for fraction in close_fractions]
         
-        for i, level in enumerate(sl_levels):
-            sl_quantity = round(quantity * level['close_fraction'], symbol_info.quantity_precision)
-            
-            # Calculate SL price
-            if close_side == OrderSide.SELL.value:  # Long position
-                sl_price = entry_price - (atr * level['atr_multiple'])
-            else:  # Short position
-                sl_price = entry_price + (atr * level['atr_multiple'])
-            
-            sl_price_str = f"{sl_price:.{symbol_info.price_precision}f}"
-            
-            # Check minimum notional
-            if sl_quantity * sl_price < symbol_info.min_notional:
-                logging.warning(f"Skipping Stop Loss order #{i+1} as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
-                continue
-            
-            try:
-                self.client.new_order(
-                    symbol=symbol,
-                    side=close_side,
-                    type='STOP_MARKET',
-                    stopPrice=sl_price_str,
-                    quantity=sl_quantity
-                )
-                logging.info(f"Stop Loss order #{i+1} placed: close {sl_quantity} at {sl_price_str}")
-                remaining_quantity -= sl_quantity
-            except ClientError as e:
-                logging.error(f"Failed to place SL order #{i+1}: {e}")
+        # Skip levels that round down to nothing, then check minimum notional
+        quantities = np.array(level_quantities, dtype=np.float64)
+        quantity_mask = quantities > 0
+        notional_mask = quantity_mask & (quantities * prices >= symbol_info.min_notional)
+        for i in np.flatnonzero(~quantity_mask):
+            logging.warning(f"Skipping {label} order #{i+1} as its quantity rounds down to zero.")
+        for i in np.flatnonzero(quantity_mask & ~notional_mask):
+            logging.warning(f"Skipping {label} order #{i+1} as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
         
-        return remaining_quantity
-
-    def _create_final_sl(self, symbol: str, close_side: str, entry_price: float, 
-                        remaining_quantity: float, last_sl_atr: float, atr: float, symbol_info: SymbolInfo):
-        """Create final SL order for remaining quantity"""
-        if close_side == OrderSide.SELL.value:  # Long position
-            last_sl_price = entry_price - (atr * last_sl_atr)
-        else:  # Short position
-            last_sl_price = entry_price + (atr * last_sl_atr)
+        price_fmt = symbol_info.price_fmt
+        placed_indices = np.flatnonzero(notional_mask)
+        for i in placed_indices:
+            price_str = price_fmt(prices[i])
+            level_quantity = level_quantities[i]
+            orders.append((f"{label} order #{i+1}: close {level_quantity} at {price_str}", {
+                "symbol": symbol,
+                "side": close_side,
+                "type": order_type,
+                "stopPrice": price_str,
+                "quantity": str(level_quantity)
+            }))
         
-        last_sl_price_str = f"{last_sl_price:.{symbol_info.price_precision}f}"
+        return float(quantity_decimal - sum(level_quantities[i] for i in placed_indices))
+    
+    def _build_final_order(self, orders: List[Tuple[str, Dict]], label: str, order_type: str, symbol: str, close_side: str,
+                           direction: float, entry_price: float, remaining_quantity: float, last_atr: float,
+                           atr: float, symbol_info: SymbolInfo):
+        """Build final TP or SL order for remaining quantity"""
+        last_price = entry_price + direction * atr * last_atr
         
-        if remaining_quantity * last_sl_price >= symbol_info.min_notional:
-            try:
-                self.client.new_order(
-                    symbol=symbol,
-                    side=close_side,
-                    type='STOP_MARKET',
-                    stopPrice=last_sl_price_str,
-                    quantity=round(remaining_quantity, symbol_info.quantity_precision)
-                )
-                logging.info(f"Stop Loss order #final (remaining) placed: close {round(remaining_quantity, symbol_info.quantity_precision)} at {last_sl_price_str}")
-            except ClientError as e:
-                logging.error(f"Failed to place final SL order: {e}")
+        last_price_str = symbol_info.price_fmt(last_price)
+        
+        if remaining_quantity * last_price >= symbol_info.min_notional:
+            final_quantity = Decimal(str(remaining_quantity)).quantize(symbol_info.quantity_step, rounding=ROUND_DOWN)
+            orders.append((f"{label} order #final (remaining): close {final_quantity} at {last_price_str}", {
+                "symbol": symbol,
+                "side": close_side,
+                "type": order_type,
+                "stopPrice": last_price_str,
+                "quantity": str(final_quantity)
+            }))
         else:
-            logging.warning(f"Skipping final Stop Loss order as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
+            logging.warning(f"Skipping final {label} order as its notional value is below the minimum required ({symbol_info.min_notional} USDT).")
     
-    def _create_trailing_sl(self, symbol: str, close_side: str, entry_price: float, 
-                           quantity: float, trailing_sl_atr: float, atr: float):
-        """Create trailing stop loss order"""
+    def _build_trailing_sl(self, orders: List[Tuple[str, Dict]], symbol: str, close_side: str, entry_price: float, 
+                           quantity: float, trailing_sl_atr: float, atr: float, symbol_info: SymbolInfo):
+        """Build trailing stop loss order"""
         callback_rate = max(round((atr * trailing_sl_atr / entry_price) * 100, 2), 0.1)
         
+        orders.append((f"Trailing SL with callback rate: {callback_rate}%", {
+            "symbol": symbol,
+            "side": close_side,
+            "type": "TRAILING_STOP_MARKET",
+            "quantity": symbol_info.qty_fmt(quantity),
+            "callbackRate": str(callback_rate),
+            "reduceOnly": "true"
+        }))
+    
+    def _submit_orders(self, orders: List[Tuple[str, Dict]]):
+        """Submit orders through batchOrders, dispatching the batches of BATCH_ORDER_LIMIT concurrently"""
+        batches = [orders[start:start + BATCH_ORDER_LIMIT] for start in range(0, len(orders), BATCH_ORDER_LIMIT)]
+        if len(batches) <= 1:
+            for batch in batches:
+                self._submit_batch(batch)
+            return
+        
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            list(executor.map(self._submit_batch, batches))
+    
+    def _submit_batch(self, batch: List[Tuple[str, Dict]]):
+        """Place one batchOrders request and log the outcome of each order"""
         try:
-            self.client.new_order(
-                symbol=symbol,
-                side=close_side,
-                type='TRAILING_STOP_MARKET',
-                quantity=quantity,
-                callbackRate=callback_rate,
-                reduceOnly=True
-            )
-            logging.info(f"Trailing SL placed with callback rate: {callback_rate}%")
+            responses = self.client.new_batch_order(batchOrders=[params for _, params in batch])
         except ClientError as e:
-            logging.error(f"Failed to place trailing SL: {e}")
+            logging.error(f"Failed to place batch of {len(batch)} orders: {e}")
+            return
+        
+        # Responses are returned in the same order as the submitted orders
+        for (description, _), response in zip(batch, responses):
+            if 'code' in response:
+                logging.error(f"Failed to place {description}: {response.get('msg')}")
+            else:
+                logging.info(f"{description} placed")
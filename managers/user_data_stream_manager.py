@@ -0,0 +1,122 @@
+import json
+import logging
+import queue
+import threading
+import uuid
+from typing import Dict, Optional
+from binance.um_futures import UMFutures
+from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+from utils.binance_websocket import stop_websocket
+
+class UserDataStreamManager:
+    """Handles the futures user-data websocket and order fill notifications"""
+
+    def __init__(self, client: UMFutures):
+        self.client = client
+        self.listen_key: Optional[str] = None
+        self.ws_client: Optional[UMFuturesWebsocketClient] = None
+        # Cleared by the socket thread when the stream drops, the client is kept for stop() to close
+        self._connected = False
+        self._fill_queues: Dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self.ws_client is not None and self._connected
+
+    def start(self) -> bool:
+        """Open the user-data stream, returns False if it could not be started"""
+        self.stop()
+        try:
+            self.listen_key = self.client.new_listen_key()['listenKey']
+            self._connected = True
+            self.ws_client = UMFuturesWebsocketClient(on_message=self._on_message, on_close=self._on_close,
+                                                      on_error=self._on_error)
+            self.ws_client.user_data(listen_key=self.listen_key)
+            logging.info("User data stream started")
+            return True
+        except Exception as e:
+            logging.warning(f"Could not start user data stream, falling back to REST polling: {e}")
+            self.stop()
+            return False
+
+    def stop(self):
+        """Close the user-data stream if it is open, must not be called from the stream's socket thread"""
+        ws_client, self.ws_client = self.ws_client, None
+        self._connected = False
+        if ws_client is None:
+            return
+        try:
+            stop_websocket(ws_client)
+        except Exception as e:
+            logging.warning(f"Could not close user data stream: {e}")
+
+    def renew_listen_key(self):
+        """Extend the listen key validity, Binance expires it after 60 minutes"""
+        if not self.is_running:
+            return
+        try:
+            self.client.renew_listen_key(self.listen_key)
+            logging.info("User data stream listen key renewed")
+        except Exception as e:
+            logging.warning(f"Could not renew user data stream listen key, restarting stream: {e}")
+            self.start()
+
+    def register_order(self) -> Optional[str]:
+        """Reserve a client order id whose fill will be captured from the stream"""
+        if not self.is_running:
+            return None
+
+        client_order_id = uuid.uuid4().hex
+        with self._lock:
+            self._fill_queues[client_order_id] = queue.Queue()
+        return client_order_id
+
+    def discard_order(self, client_order_id: Optional[str]):
+        """Stop tracking a registered order, e.g. when it was never placed"""
+        with self._lock:
+            self._fill_queues.pop(client_order_id, None)
+
+    def wait_for_fill(self, client_order_id: Optional[str], timeout: float = 0.5) -> Optional[float]:
+        """Wait for the FILLED update of a registered order and return its average price"""
+        with self._lock:
+            fill_queue = self._fill_queues.get(client_order_id)
+        if fill_queue is None:
+            return None
+
+        try:
+            return fill_queue.get(timeout=timeout)
+        except queue.Empty:
+            logging.warning(f"No fill update received for order {client_order_id} within {timeout}s")
+            return None
+        finally:
+            self.discard_order(client_order_id)
+
+    def _on_close(self, _):
+        """Mark the stream as down so the maintenance loop closes and reopens it"""
+        logging.warning("User data stream closed")
+        self._connected = False
+
+    def _on_error(self, _, error: Exception):
+        """Mark the stream as down so the maintenance loop closes and reopens it"""
+        logging.warning(f"User data stream error: {error}")
+        self._connected = False
+
+    def _on_message(self, _, message: str):
+        """Push average fill price of filled orders to their waiting queue"""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logging.warning(f"Ignoring malformed user data stream message: {message}")
+            return
+        if data.get('e') != 'ORDER_TRADE_UPDATE':
+            return
+
+        order = data['o']
+        if order.get('X') != 'FILLED':
+            return
+
+        with self._lock:
+            fill_queue = self._fill_queues.get(order.get('c'))
+        if fill_queue is not None:
+            fill_queue.put_nowait(float(order['ap']))
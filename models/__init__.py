@@ -5,5 +5,6 @@ Models package for trading bot data structures.
 from .position_info import PositionInfo
 from .symbol_info import SymbolInfo
 from .tp_sl_info import TakeProfitStopLossInfo
+from .trade_context import TradeContext
 
-__all__ = ['PositionInfo', 'SymbolInfo', 'TakeProfitStopLossInfo']
+__all__ = ['PositionInfo', 'SymbolInfo', 'TakeProfitStopLossInfo', 'TradeContext']
@@ -0,0 +1,8 @@
+from typing import Any, Dict
+
+# Timestamp field names that Azure Table Storage entities might use, checked in order
+TIMESTAMP_FIELDS = ("Timestamp", "timestamp", "_ts", "last_modified", "odata.etag")
+
+def first_value(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
+    """Return the value of the first key present with a non-None value"""
+    return next((data[key] for key in keys if data.get(key) is not None), default)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from trading_enums import PositionSide
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PositionInfo:
     """Data class for position information"""
     symbol: str
@@ -1,9 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SymbolInfo:
     """Data class for symbol trading information"""
     symbol: str
     price_precision: int
     quantity_precision: int
     min_notional: float = 5.0
+    price_fmt: Callable[[float], str] = field(init=False, repr=False, compare=False)
+    qty_fmt: Callable[[float], str] = field(init=False, repr=False, compare=False)
+    quantity_step: Decimal = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Format specs are built once per symbol instead of on every order
+        object.__setattr__(self, 'price_fmt', f"{{:.{self.price_precision}f}}".format)
+        object.__setattr__(self, 'qty_fmt', f"{{:.{self.quantity_precision}f}}".format)
+        object.__setattr__(self, 'quantity_step', Decimal(10) ** -self.quantity_precision)
@@ -1,8 +1,10 @@
+import logging
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
+from models.entity_fields import TIMESTAMP_FIELDS, first_value
 
-@dataclass
+@dataclass(slots=True)
 class TakeProfitStopLossInfo:
     """Data class for Take Profit and Stop Loss information"""
     atr_multiple: float
@@ -26,35 +28,23 @@ class TakeProfitStopLossInfo:
     @classmethod
     def from_entity(cls, entity: Dict[str, Any]) -> 'TakeProfitStopLossInfo':
         """Create instance from Azure Table Storage entity"""
-        import logging
-        
-        # Debug: Log all available keys in the entity
-        logging.info(f"Entity keys: {list(entity.keys())}")
-        logging.info(f"Full entity: {entity}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"Entity keys: {list(entity.keys())}")
+            logging.debug(f"Full entity: {entity}")
         
         # Try different timestamp field names that Azure Table Storage might use
-        # Note: Azure Table Storage system properties might be accessed differently
-        timestamp = None
-        
-        # Check various possible timestamp fields
-        for ts_field in ["Timestamp", "timestamp", "_ts", "last_modified", "odata.etag"]:
-            if ts_field in entity:
-                timestamp = entity[ts_field]
-                logging.info(f"Found timestamp in field '{ts_field}': {timestamp}")
-                break
+        timestamp = next((entity[ts_field] for ts_field in TIMESTAMP_FIELDS if ts_field in entity), None)
         
         # If no timestamp found, try to get it from metadata or etag
         if not timestamp and hasattr(entity, 'metadata'):
             timestamp = getattr(entity, 'metadata', {}).get('timestamp')
-            logging.info(f"Found timestamp in metadata: {timestamp}")
         
         # If still no timestamp, use current time as fallback
         if not timestamp:
-            from datetime import datetime, timezone
             timestamp = datetime.now(timezone.utc)
-            logging.info(f"Using current time as timestamp: {timestamp}")
         
-        logging.info(f"Final timestamp value: {timestamp}, type: {type(timestamp)}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"Final timestamp value: {timestamp}, type: {type(timestamp)}")
         
         return cls(
             atr_multiple=float(entity.get("atr_multiple", 0.0)),
@@ -68,7 +58,7 @@ class TakeProfitStopLossInfo:
     def from_dict(cls, data: Dict[str, Any]) -> 'TakeProfitStopLossInfo':
         """Create instance from dictionary (e.g., from HTTP request)"""
         # Support both "id" and "RowKey" formats
-        row_key = data.get("id") or data.get("RowKey")
+        row_key = first_value(data, "id", "RowKey")
         # Support custom PartitionKey, default to "tp"
         partition_key = data.get("PartitionKey", "tp")
         
@@ -82,8 +72,7 @@ class TakeProfitStopLossInfo:
     def validate(self) -> bool:
         """Validate the data"""
         return (
-            self.atr_multiple > 0 and
-            self.close_fraction >= 0 and
-            self.close_fraction <= 100 and
-            self.row_key is not None
+            self.row_key is not None and
+            0 <= self.close_fraction <= 100 and
+            self.atr_multiple > 0
         )
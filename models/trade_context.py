@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from models.symbol_info import SymbolInfo
+
+@dataclass
+class TradeContext:
+    """Data class for market/account data fetched once per trade signal"""
+    usdt_balance: float
+    current_price: float
+    symbol_info: SymbolInfo
+    atr: float
@@ -1,6 +1,8 @@
+import logging
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
+from models.entity_fields import TIMESTAMP_FIELDS, first_value
 
 @dataclass
 class TradingConfigInfoData:
@@ -26,34 +28,23 @@ class TradingConfigInfoData:
     @classmethod
     def from_entity(cls, entity: Dict[str, Any]) -> 'TradingConfigInfoData':
         """Create instance from Azure Table Storage entity"""
-        import logging
-        
-        # Debug: Log all available keys in the entity
-        logging.info(f"Entity keys: {list(entity.keys())}")
-        logging.info(f"Full entity: {entity}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"Entity keys: {list(entity.keys())}")
+            logging.debug(f"Full entity: {entity}")
         
         # Try different timestamp field names that Azure Table Storage might use
-        timestamp = None
-        
-        # Check various possible timestamp fields
-        for ts_field in ["Timestamp", "timestamp", "_ts", "last_modified", "odata.etag"]:
-            if ts_field in entity:
-                timestamp = entity[ts_field]
-                logging.info(f"Found timestamp in field '{ts_field}': {timestamp}")
-                break
+        timestamp = next((entity[ts_field] for ts_field in TIMESTAMP_FIELDS if ts_field in entity), None)
         
         # If no timestamp found, try to get it from metadata or etag
         if not timestamp and hasattr(entity, 'metadata'):
             timestamp = getattr(entity, 'metadata', {}).get('timestamp')
-            logging.info(f"Found timestamp in metadata: {timestamp}")
         
         # If still no timestamp, use current time as fallback
         if not timestamp:
-            from datetime import datetime, timezone
             timestamp = datetime.now(timezone.utc)
-            logging.info(f"Using current time as timestamp: {timestamp}")
         
-        logging.info(f"Final timestamp value: {timestamp}, type: {type(timestamp)}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"Final timestamp value: {timestamp}, type: {type(timestamp)}")
         
         return cls(
             leverage=int(entity.get("LEVERAGE", 1)),
@@ -67,13 +58,13 @@ class TradingConfigInfoData:
     def from_dict(cls, data: Dict[str, Any]) -> 'TradingConfigInfoData':
         """Create instance from dictionary (e.g., from HTTP request)"""
         # Support both "id" and "RowKey" formats
-        row_key = data.get("id") or data.get("RowKey")
+        row_key = first_value(data, "id", "RowKey")
         # Support custom PartitionKey, use row_key as default (symbol)
         partition_key = data.get("PartitionKey", row_key)
         
         return cls(
-            leverage=int(data.get("leverage") or data.get("LEVERAGE", 1)),
-            wallet_allocation=float(data.get("wallet_allocation") or data.get("WALLET_ALLOCATION", 0.0)),
+            leverage=int(first_value(data, "leverage", "LEVERAGE", default=1)),
+            wallet_allocation=float(first_value(data, "wallet_allocation", "WALLET_ALLOCATION", default=0.0)),
             row_key=row_key,
             partition_key=partition_key
         )
@@ -1,9 +1,62 @@
 # technical_analysis.py
 
+import json
 import logging
+import threading
+import time
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
+from typing import Dict, Optional, Set, Tuple
 from binance.um_futures import UMFutures
+from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+from utils.binance_websocket import stop_websocket
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+# Seconds per unit of a UTC-aligned Binance candle interval (e.g. '15m', '4h', '1d')
+TIMEFRAME_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400}
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """
+    Converts a Binance candle interval into its length in seconds.
+
+    Args:
+        timeframe (str): The candle interval (e.g., '1m', '15m', '1h', '1d').
+
+    Returns:
+        The interval length in seconds.
+    """
+    try:
+        return int(timeframe[:-1]) * TIMEFRAME_UNIT_SECONDS[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+def wilder_atr_update(atr: float, prev_close: float, highs: np.ndarray, lows: np.ndarray,
+                      closes: np.ndarray, length: int) -> float:
+    """
+    Advances a Wilder-smoothed ATR over newly closed candles.
+
+    Args:
+        atr (float): The ATR as of the last candle already included.
+        prev_close (float): The close of that candle.
+        highs (np.ndarray): The highs of the new candles, oldest first.
+        lows (np.ndarray): The lows of the new candles, oldest first.
+        closes (np.ndarray): The closes of the new candles, oldest first.
+        length (int): The ATR lookback period.
+
+    Returns:
+        The ATR as of the last new candle.
+    """
+    # Plain floats are much cheaper than NumPy scalars in a sequential loop
+    for high, low, close in zip(highs.tolist(), lows.tolist(), closes.tolist()):
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr = (atr * (length - 1) + true_range) / length
+        prev_close = close
+    return atr
 
 class TechnicalAnalysis:
     """
@@ -19,11 +72,38 @@ class TechnicalAnalysis:
         if not client:
             raise ValueError("A valid Binance UMFutures client is required.")
         self.client = client
+        # Latest candles per (symbol, timeframe), later fetches only request the candles after them
+        self._candle_cache: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._candle_lock = threading.Lock()
+        # Kline websocket keeping the cached candles of the subscribed (symbol, timeframe) pairs current,
+        # it is opened and replaced only from subscription threads holding _stream_lock
+        self._ws_client: Optional[UMFuturesWebsocketClient] = None
+        self._stream_lock = threading.Lock()
+        self._stream_down = False
+        self._streamed_candles: Set[Tuple[str, str]] = set()
+        self._pending_streams: Set[Tuple[str, str]] = set()
+        # Last ATR per (symbol, timeframe, length) with the close and open time of the candle it was read from
+        self._atr_state: Dict[Tuple[str, str, int], Tuple[float, float, pd.Timestamp]] = {}
 
     def get_historical_candles(self, symbol: str, timeframe: str = '15m', limit: int = 200) -> pd.DataFrame:
         """
         Fetches historical candlestick data for a given symbol and timeframe.
 
+        Args:
+            symbol (str): The trading symbol (e.g., 'DOGEUSDT').
+            timeframe (str): The candle interval (e.g., '1m', '5m', '15m', '1h', '4h', '1d').
+            limit (int): The number of candles to fetch (max 1500).
+
+        Returns:
+            A pandas DataFrame with columns ['timestamp', 'open', 'high', 'low', 'close', 'volume'],
+            or an empty DataFrame if an error occurs.
+        """
+        return self._load_candles(symbol, timeframe, limit).copy()
+
+    def _load_candles(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        Loads candles through the cache, the returned frame may be shared with it and must not be modified.
+
         Args:
             symbol (str): The trading symbol (e.g., 'DOGEUSDT').
             timeframe (str): The candle interval (e.g., '1m', '5m', '15m', '1h', '4h', '1d').
@@ -34,38 +114,260 @@ class TechnicalAnalysis:
             or an empty DataFrame if an error occurs.
         """
         try:
-            # Fetch raw klines data from Binance API
-            # The API returns a list of lists, e.g., [timestamp, open, high, low, close, ...]
-            klines = self.client.klines(symbol=symbol, interval=timeframe, limit=limit)
+            cache_key = (symbol, timeframe)
+            cached = self._candle_cache.get(cache_key)
             
-            # Define column names for clarity
-            columns = [
-                'timestamp', 'open', 'high', 'low', 'close', 'volume', 
-                'close_time', 'quote_asset_volume', 'number_of_trades', 
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ]
+            # Candles kept current by the kline stream are served without a request
+            if cache_key in self._streamed_candles and self._is_current(cached, timeframe, limit):
+                return cached.tail(limit).reset_index(drop=True)
             
-            # Convert the raw data into a pandas DataFrame
-            df = pd.DataFrame(klines, columns=columns)
-
-            # --- Data Cleaning and Type Conversion ---
-            # Select only the columns we need for TA
-            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            start_time = self._delta_start_time(cached, timeframe, limit)
             
-            # Convert timestamp to a readable datetime format (optional, but good practice)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            # Fetch raw klines data from Binance API, only from the last cached candle on when possible
+            # The API returns a list of lists, e.g., [timestamp, open, high, low, close, ...]
+            if start_time is not None:
+                klines = self.client.klines(symbol=symbol, interval=timeframe, startTime=start_time, limit=limit)
+            else:
+                klines = self.client.klines(symbol=symbol, interval=timeframe, limit=limit)
+            df = self._klines_to_frame(klines)
             
-            # Convert price and volume columns to numeric types for calculations
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
+            # Replace the cached candles from the first fetched one on (the last cached candle was still open)
+            if start_time is not None:
+                if df.empty:
+                    return cached
+                df = pd.concat([cached[cached['timestamp'] < df['timestamp'].iloc[0]], df], ignore_index=True)
+            df = df.tail(limit).reset_index(drop=True)
+            with self._candle_lock:
+                self._candle_cache[cache_key] = df
             
             return df
 
         except Exception as e:
-            logging.error(f"An error occurred while fetching historical candles for {symbol}: {e}")
+            logging.error("An error occurred while fetching historical candles for %s: %s", symbol, e)
             # Return an empty DataFrame in case of an error
             return pd.DataFrame()
 
+    def stream_candles(self, symbol: str, timeframe: str):
+        """
+        Subscribes to kline updates so the cached candles of a symbol stay current between requests.
+        The websocket is opened on a background thread, so the caller never waits for the handshake.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'DOGEUSDT').
+            timeframe (str): The candle interval (e.g., '1m', '15m', '1h').
+        """
+        key = (symbol, timeframe)
+        with self._candle_lock:
+            if key in self._streamed_candles or key in self._pending_streams:
+                return
+            self._pending_streams.add(key)
+        threading.Thread(target=self._subscribe, args=key, daemon=True).start()
+
+    def _subscribe(self, symbol: str, timeframe: str):
+        """
+        Adds a kline subscription, (re)opening the websocket first when there is none or it went down.
+
+        Args:
+            symbol (str): The trading symbol (e.g., 'DOGEUSDT').
+            timeframe (str): The candle interval (e.g., '1m', '15m', '1h').
+        """
+        key = (symbol, timeframe)
+        try:
+            with self._stream_lock:
+                if self._ws_client is None or self._stream_down:
+                    self._reopen_stream()
+                self._ws_client.kline(symbol=symbol, interval=timeframe)
+                with self._candle_lock:
+                    # A stream that dropped meanwhile is reopened by the next request instead
+                    if self._stream_down:
+                        return
+                    self._streamed_candles.add(key)
+            logging.info("Streaming %s candles for %s", timeframe, symbol)
+        except Exception as e:
+            logging.warning("Could not stream %s candles for %s, using REST requests: %s", timeframe, symbol, e)
+        finally:
+            with self._candle_lock:
+                self._pending_streams.discard(key)
+
+    def _reopen_stream(self):
+        """
+        Closes the current kline websocket, if any, and opens a new one without subscriptions.
+        """
+        if self._ws_client is not None:
+            try:
+                stop_websocket(self._ws_client)
+            except Exception as e:
+                logging.warning("Could not close candle stream: %s", e)
+            self._ws_client = None
+        
+        with self._candle_lock:
+            self._streamed_candles.clear()
+            self._stream_down = False
+        self._ws_client = UMFuturesWebsocketClient(on_message=self._on_kline, on_close=self._on_stream_closed,
+                                                   on_error=self._on_stream_error)
+
+    def _on_kline(self, _, message: str):
+        """
+        Applies a kline update to the cached candles, replacing the open candle or rolling a new one in.
+
+        Args:
+            message (str): The raw websocket message.
+        """
+        try:
+            data = json.loads(message)
+            if data.get('e') != 'kline':
+                return
+            
+            kline = data['k']
+            key = (data['s'], kline['i'])
+            candle = pd.DataFrame({
+                'timestamp': np.array([kline['t']], dtype=np.int64).view('datetime64[ms]'),
+                'open': [float(kline['o'])],
+                'high': [float(kline['h'])],
+                'low': [float(kline['l'])],
+                'close': [float(kline['c'])],
+                'volume': [float(kline['v'])]
+            })
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning("Ignoring malformed candle stream message: %s", e)
+            return
+        
+        try:
+            timeframe_ms = timeframe_to_seconds(kline['i']) * 1000
+        except ValueError:
+            timeframe_ms = None
+        
+        with self._candle_lock:
+            cached = self._candle_cache.get(key)
+            # Updates are only applied on top of candles backfilled through REST
+            if cached is None or cached.empty:
+                return
+            last_open_ms = int(cached['timestamp'].iloc[-1].value // 1_000_000)
+            if kline['t'] == last_open_ms:
+                kept = cached.iloc[:-1]
+            elif timeframe_ms is not None and kline['t'] == last_open_ms + timeframe_ms:
+                kept = cached.iloc[1:]
+            elif kline['t'] > last_open_ms:
+                # Candles were missed while the stream was down, the next load refetches them
+                del self._candle_cache[key]
+                return
+            else:
+                return
+            self._candle_cache[key] = pd.concat([kept, candle], ignore_index=True)
+
+    def _on_stream_closed(self, _):
+        """
+        Drops the kline subscriptions when the websocket closes so the next ATR request subscribes again.
+        """
+        logging.warning("Candle stream closed, using REST requests until it is reopened")
+        self._reset_stream()
+
+    def _on_stream_error(self, _, error: Exception):
+        """
+        Drops the kline subscriptions when the websocket fails so the next ATR request subscribes again.
+
+        Args:
+            error (Exception): The error raised by the websocket.
+        """
+        logging.warning("Candle stream failed, using REST requests until it is reopened: %s", error)
+        self._reset_stream()
+
+    def _reset_stream(self):
+        """
+        Marks the websocket as down and forgets its subscriptions. The client is kept so the next
+        subscription closes it, as the socket thread running this callback cannot join itself.
+        """
+        with self._candle_lock:
+            self._stream_down = True
+            self._streamed_candles.clear()
+
+    def _is_current(self, cached: Optional[pd.DataFrame], timeframe: str, limit: int) -> bool:
+        """
+        Checks whether cached candles run without gaps up to the currently open candle.
+
+        Args:
+            cached (pd.DataFrame): The candles cached for the symbol and timeframe, if any.
+            timeframe (str): The candle interval.
+            limit (int): The number of candles requested.
+
+        Returns:
+            True if the cache can be returned as is.
+        """
+        if cached is None or len(cached) < limit:
+            return False
+        try:
+            timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+        except ValueError:
+            return False
+        
+        first_open_ms = int(cached['timestamp'].iloc[0].value // 1_000_000)
+        last_open_ms = int(cached['timestamp'].iloc[-1].value // 1_000_000)
+        current_open_ms = int(time.time() * 1000) // timeframe_ms * timeframe_ms
+        return last_open_ms == current_open_ms and last_open_ms - first_open_ms == (len(cached) - 1) * timeframe_ms
+
+    def _delta_start_time(self, cached: Optional[pd.DataFrame], timeframe: str, limit: int) -> Optional[int]:
+        """
+        Determines from which candle open time the cached candles can be extended.
+
+        Args:
+            cached (pd.DataFrame): The candles cached for the symbol and timeframe, if any.
+            timeframe (str): The candle interval.
+            limit (int): The number of candles requested.
+
+        Returns:
+            The open time in milliseconds of the last cached candle, or None if a full fetch is needed.
+        """
+        if cached is None or len(cached) < limit:
+            return None
+        try:
+            timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+        except ValueError:
+            return None
+        
+        # The fetch must reach the current candle within a single request
+        last_open_ms = int(cached['timestamp'].iloc[-1].value // 1_000_000)
+        if time.time() * 1000 - last_open_ms >= (limit - 1) * timeframe_ms:
+            return None
+        return last_open_ms
+
+    def _klines_to_frame(self, klines: list) -> pd.DataFrame:
+        """
+        Converts raw klines into a DataFrame of numeric candles.
+
+        Args:
+            klines (list): The klines as returned by the Binance API.
+
+        Returns:
+            A pandas DataFrame with columns ['timestamp', 'open', 'high', 'low', 'close', 'volume'].
+        """
+        # Only the open time and OHLCV columns are needed for TA
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        if not klines:
+            # Typed columns so concatenating an empty response never turns prices into object dtype
+            return pd.DataFrame({'timestamp': np.array([], dtype='datetime64[ms]'),
+                                 **{column: np.array([], dtype=np.float64) for column in columns}})
+        
+        # Keep only open time and OHLCV of each kline, then convert all price and volume strings to float64 in one pass
+        raw = np.array([kline[:6] for kline in klines], dtype=object)
+        df = pd.DataFrame(raw[:, 1:6].astype(np.float64), columns=columns)
+        
+        # Binance open times are epoch milliseconds, so they can be viewed as datetimes directly
+        df.insert(0, 'timestamp', raw[:, 0].astype(np.int64).view('datetime64[ms]'))
+        
+        return df
+
+    def _price_arrays(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extracts the high, low and close columns as contiguous float64 arrays for indicator kernels.
+
+        Args:
+            df (pd.DataFrame): Candles as returned by get_historical_candles.
+
+        Returns:
+            The (high, low, close) arrays.
+        """
+        return tuple(np.ascontiguousarray(df[column].to_numpy(np.float64)) for column in ('high', 'low', 'close'))
+
     def get_atr(self, symbol: str, timeframe: str = '15m', length: int = 14) -> float | None:
         """
         Calculates the Average True Range (ATR) for a given symbol.
@@ -78,30 +380,57 @@ class TechnicalAnalysis:
         Returns:
             The most recent ATR value as a float, or None if the calculation fails.
         """
-        logging.info(f"Calculating ATR({length}) for {symbol} on the {timeframe} timeframe.")
+        # The ATR is read from the last closed candle, so it only changes once the candle after it closes
+        key = (symbol, timeframe, length)
+        state = self._atr_state.get(key)
+        if state is not None:
+            try:
+                next_close_ms = int(state[2].value // 1_000_000) + 2 * timeframe_to_seconds(timeframe) * 1000
+                if time.time() * 1000 < next_close_ms:
+                    return state[0]
+            except ValueError:
+                pass
+        
+        logging.info("Calculating ATR(%d) for %s on the %s timeframe.", length, symbol, timeframe)
         
         # Fetch enough historical data for the calculation. 
         # We need at least 'length' periods, but fetching more ensures accuracy.
-        df = self.get_historical_candles(symbol, timeframe, limit=length + 100)
+        # The ATR only reads the price columns, so the cached frame is used without a copy.
+        df = self._load_candles(symbol, timeframe, limit=length + 100)
 
         if df.empty or len(df) < length:
-            logging.warning(f"Could not calculate ATR for {symbol}: Not enough historical data returned.")
+            logging.warning("Could not calculate ATR for %s: Not enough historical data returned.", symbol)
             return None
 
         try:
-            # Use the pandas-ta library to calculate ATR.
-            # The 'append=True' argument adds the ATR column directly to our DataFrame.
-            df.ta.atr(length=length, append=True)
+            # The last candle is still open, the ATR is read from the closed ones
+            closed = df.iloc[:-1]
             
-            # The ATR column will be named 'ATRr_14' (for length 14).
-            atr_column_name = f'ATRr_{length}'
+            if state is not None and (closed['timestamp'] == state[2]).any():
+                # Roll the previous ATR forward over the candles closed since it was calculated
+                highs, lows, closes = self._price_arrays(closed[closed['timestamp'] > state[2]])
+                latest_atr = wilder_atr_update(state[0], state[1], highs, lows, closes, length)
+            elif talib is not None:
+                # TA-Lib computes Wilder's ATR in C straight from the price arrays.
+                highs, lows, closes = self._price_arrays(df)
+                atr_values = talib.ATR(highs, lows, closes, timeperiod=length)
+                
+                # Get the most recent ATR value (from the second to last candle, as the last one is still open)
+                latest_atr = atr_values[-2]
+            else:
+                # Use the pandas-ta library to calculate ATR, returned as a series instead of a new column.
+                atr_values = ta.atr(df['high'], df['low'], df['close'], length=length)
+                
+                # Get the most recent ATR value (from the second to last candle, as the last one is still open)
+                latest_atr = atr_values.iloc[-2]
             
-            # Get the most recent ATR value (from the second to last candle, as the last one is still open)
-            latest_atr = df[atr_column_name].iloc[-2]
+            latest_atr = float(latest_atr)
+            if np.isfinite(latest_atr):
+                self._atr_state[key] = (latest_atr, float(closed['close'].iloc[-1]), closed['timestamp'].iloc[-1])
             
-            logging.info(f"Successfully calculated latest ATR for {symbol}: {latest_atr}")
-            return float(latest_atr)
+            logging.info("Successfully calculated latest ATR for %s: %s", symbol, latest_atr)
+            return latest_atr
 
         except Exception as e:
-            logging.error(f"An error occurred during ATR calculation for {symbol}: {e}")
-            return None
\ No newline at end of file
+            logging.error("An error occurred during ATR calculation for %s: %s", symbol, e)
+            return None
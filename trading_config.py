@@ -21,4 +21,13 @@ GENERIC_ROUNDING = Decimal('0.00000001')
 # Configuration for futures trading
 SYMBOL = 'DOGEUSDT'
 TP_SL_TABLE_NAME = "TakeProfitAndStopLoss"
-TRADING_CONFIG_TABLE_NAME = "TradingConfigs"
\ No newline at end of file
+TRADING_CONFIG_TABLE_NAME = "TradingConfigs"
+
+# Binance connection maintenance
+TIME_SYNC_INTERVAL_SECONDS = 5 * 60
+LISTEN_KEY_RENEW_INTERVAL_SECONDS = 25 * 60
+SYMBOL_INFO_REFRESH_SECONDS = 6 * 60 * 60
+# Connections kept open to Binance, covers the concurrent REST calls of overlapping signals
+BINANCE_HTTP_POOL_SIZE = 20
+# Bounds the websocket handshake and the wait for a closed stream's thread
+WEBSOCKET_TIMEOUT_SECONDS = 5
@@ -16,40 +16,49 @@ class OrderSide(Enum):
     BUY = "BUY"
     SELL = "SELL"
 
+# Conversion tables built once from the enums above
+_SIGNAL_TO_POSITION_SIDE = {SignalType.LONG.value: PositionSide.LONG.value, SignalType.SHORT.value: PositionSide.SHORT.value}
+_SIGNAL_TO_ORDER_SIDE = {SignalType.LONG.value: OrderSide.BUY.value, SignalType.SHORT.value: OrderSide.SELL.value}
+_POSITION_TO_CLOSE_SIDE = {PositionSide.LONG.value: OrderSide.SELL.value, PositionSide.SHORT.value: OrderSide.BUY.value}
+_ORDER_TO_CLOSE_SIDE = {OrderSide.BUY.value: OrderSide.SELL.value, OrderSide.SELL.value: OrderSide.BUY.value}
+_VALID_SIGNALS = frozenset(signal.value for signal in SignalType)
+
 class TradingEnums:
     """Utility class for trading signal and position conversions"""
     
     @staticmethod
     def signal_to_position_side(signal: str) -> str:
         """Convert external signal to internal position side"""
-        if signal == SignalType.LONG.value:
-            return PositionSide.LONG.value
-        elif signal == SignalType.SHORT.value:
-            return PositionSide.SHORT.value
-        else:
+        try:
+            return _SIGNAL_TO_POSITION_SIDE[signal]
+        except KeyError:
             raise ValueError(f"Invalid signal type: {signal}")
     
     @staticmethod
     def signal_to_order_side(signal: str) -> str:
         """Convert external signal to Binance order side"""
-        if signal == SignalType.LONG.value:
-            return OrderSide.BUY.value
-        elif signal == SignalType.SHORT.value:
-            return OrderSide.SELL.value
-        else:
+        try:
+            return _SIGNAL_TO_ORDER_SIDE[signal]
+        except KeyError:
             raise ValueError(f"Invalid signal type: {signal}")
     
     @staticmethod
     def position_to_close_side(position_side: str) -> str:
         """Convert position side to closing order side"""
-        if position_side == PositionSide.LONG.value:
-            return OrderSide.SELL.value
-        elif position_side == PositionSide.SHORT.value:
-            return OrderSide.BUY.value
-        else:
+        try:
+            return _POSITION_TO_CLOSE_SIDE[position_side]
+        except KeyError:
             raise ValueError(f"Invalid position side: {position_side}")
     
+    @staticmethod
+    def order_to_close_side(order_side: str) -> str:
+        """Convert entry order side to closing order side"""
+        try:
+            return _ORDER_TO_CLOSE_SIDE[order_side]
+        except KeyError:
+            raise ValueError(f"Invalid order side: {order_side}")
+    
     @staticmethod
     def is_valid_signal(signal: str) -> bool:
         """Check if signal is valid"""
-        return signal in [SignalType.LONG.value, SignalType.SHORT.value, SignalType.CLOSE.value]
+        return signal in _VALID_SIGNALS
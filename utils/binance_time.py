@@ -0,0 +1,23 @@
+import time
+import binance.api
+from binance.um_futures import UMFutures
+
+# Difference between Binance server time and the local clock, in milliseconds
+_time_offset_ms = 0
+
+def get_timestamp() -> int:
+    """Local timestamp in ms corrected by the last measured server time offset"""
+    return int(time.time() * 1000) + _time_offset_ms
+
+def sync_time_offset(client: UMFutures) -> int:
+    """Measure the server time offset, assuming the server stamped the midpoint of the request"""
+    global _time_offset_ms
+    request_start = time.time() * 1000
+    server_time = client.time()['serverTime']
+    request_end = time.time() * 1000
+    _time_offset_ms = int(server_time - (request_start + request_end) / 2)
+    return _time_offset_ms
+
+def install_time_offset():
+    """Make the connector sign requests with the offset-corrected timestamp"""
+    binance.api.get_timestamp = get_timestamp
@@ -0,0 +1,20 @@
+import binance.websocket.binance_socket_manager as binance_socket_manager
+from binance.websocket.websocket_client import BinanceWebsocketClient
+from websocket import WebSocket, create_connection
+
+from trading_config import WEBSOCKET_TIMEOUT_SECONDS
+
+def _create_connection_with_timeout(url: str, **options) -> WebSocket:
+    ws = create_connection(url, timeout=WEBSOCKET_TIMEOUT_SECONDS, **options)
+    # The timeout only bounds the handshake, reads keep waiting for the next message
+    ws.settimeout(None)
+    return ws
+
+def install_connect_timeout():
+    """Make the connector give up on a websocket handshake after WEBSOCKET_TIMEOUT_SECONDS"""
+    binance_socket_manager.create_connection = _create_connection_with_timeout
+
+def stop_websocket(ws_client: BinanceWebsocketClient):
+    """Close a websocket client and wait a bounded time for its thread, must not be called from that thread"""
+    ws_client.socket_manager.close()
+    ws_client.socket_manager.join(WEBSOCKET_TIMEOUT_SECONDS)
@@ -1,7 +1,20 @@
+import threading
+from typing import Dict, Tuple
+
 from config.configuration import get_env_variables
 from futures_client import FuturesClient
 
+# One client per API key for the whole worker process, so invocations reuse its warm connections
+_futures_clients: Dict[Tuple[str, str], FuturesClient] = {}
+_futures_clients_lock = threading.Lock()
+
 
 def create_futures_client():
     env_vars = get_env_variables()
-    return FuturesClient(env_vars["API_KEY"], env_vars["API_SECRET"])
\ No newline at end of file
+    credentials = (env_vars["API_KEY"], env_vars["API_SECRET"])
+    with _futures_clients_lock:
+        client = _futures_clients.get(credentials)
+        if client is None:
+            client = FuturesClient(*credentials)
+            _futures_clients[credentials] = client
+    return client
@@ -0,0 +1,25 @@
+import json
+from typing import Any
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _decode_with_orjson(response: requests.Response, *args, **kwargs) -> requests.Response:
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+def install_fast_json(session: requests.Session):
+    """Decode JSON responses of the session with orjson when it is installed"""
+    if orjson is not None and _decode_with_orjson not in session.hooks['response']:
+        session.hooks['response'].append(_decode_with_orjson)
+
+def parse_request_body(req) -> Any:
+    """Parse the JSON body of an HTTP request with orjson when it is installed, raises ValueError if invalid"""
+    body = req.get_body()
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
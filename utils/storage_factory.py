@@ -1,9 +1,13 @@
+from functools import lru_cache
+
 from azure_table_storage import AzureTableStorage
 from azure.storage.queue import QueueClient
 
 from config.configuration import get_env_variables
 
 
+# Clients are reused across invocations so their HTTP pipelines keep connections open
+@lru_cache(maxsize=None)
 def create_table_storage_client(table_name: str):
     env_vars = get_env_variables()
     return AzureTableStorage(
@@ -11,6 +15,7 @@ def create_table_storage_client(table_name: str):
         table_name=table_name
     )
 
+@lru_cache(maxsize=None)
 def create_queue_client(queue_name: str):
     env_vars = get_env_variables()
     return QueueClient.from_connection_string(